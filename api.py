@@ -1,6 +1,6 @@
-import uuid, os
+import collections, contextlib, os, secrets, threading
 from flask import Flask, request, jsonify, abort, Response
-from arcade_store.store import Store
+from arcade_store.store import Store, loads  # same decoder the store reads rows with
 
 """
 arcade_store.api
@@ -12,18 +12,37 @@ Endpoints:
 - Key/value operations: /store/<key> [PUT, GET, DELETE]
 """
 
-def create_app(db_path=None):
+def create_app(db_path=None, max_sessions=10_000):
     app = Flask(__name__)
 
     # Shared store instance (SQLite-backed).
     store = Store(db_path or os.getenv("STORE_DB_PATH", "kv.sqlite3"))
+    # Exposed so callers can release it: app.extensions["arcade_store"].close()
+    app.extensions["arcade_store"] = store
 
-    # In-memory session registry: sid -> KvSession
-    _sessions = {}
+    # In-memory session registry: sid -> (KvSession, lock), least recently used first.
+    # Bounded: once full, creating a session evicts the least recently used one.
+    # _sessions_lock only guards the registry itself; each session's own lock
+    # serializes requests that operate on that session's transaction stack.
+    _sessions = collections.OrderedDict()
+    _sessions_lock = threading.Lock()
+
+    def _lookup_session(sid):
+        """
+        Return (session, lock) for sid, marking it recently used.
+        Raises 404 if the session id is unknown.
+        """
+        with _sessions_lock:
+            entry = _sessions.get(sid)
+            if entry is not None:
+                _sessions.move_to_end(sid)
+        if entry is None:
+            abort(404, description="Unknown session id")
+        return entry
 
     def _get_session(req):
         """
-        Resolve the KvSession for the current request.
+        Resolve the KvSession (and the lock guarding it) for the current request.
 
         Priority:
         - If X-Session-ID header or ?session=<id> is provided → use that session.
@@ -32,50 +51,52 @@ def create_app(db_path=None):
         """
         sid = req.headers.get("X-Session-ID") or req.args.get("session")
         if not sid:
-            # Use a temporary autocommit session (no transaction stack).
-            return store.new_session()
-        if sid not in _sessions:
-            abort(404, description="Unknown session id")
-        return _sessions[sid]
+            # Use a temporary autocommit session (no transaction stack, nothing shared).
+            return store.new_session(), contextlib.nullcontext()
+        return _lookup_session(sid)
 
     @app.post("/session")
     def create_session():
         """Create and register a new session."""
         s = store.new_session()
-        sid = str(uuid.uuid4())
-        _sessions[sid] = s
+        sid = secrets.token_urlsafe(16)
+        with _sessions_lock:
+            _sessions[sid] = (s, threading.Lock())
+            if len(_sessions) > max_sessions:
+                _sessions.popitem(last=False)
         return jsonify({"session_id": sid})
 
     @app.post("/session/<sid>/begin")
     def begin_tx(sid):
         """Start a new nested transaction layer for the session."""
-        s = _sessions.get(sid)
-        if not s:
-            abort(404, description="Unknown session id")
-        s.begin()
-        return jsonify({"ok": True, "depth": s.depth()})
+        s, lock = _lookup_session(sid)
+        with lock:
+            s.begin()
+            depth = s.depth()
+        return jsonify({"ok": True, "depth": depth})
 
     @app.post("/session/<sid>/commit")
     def commit_tx(sid):
         """Commit the top transaction layer (flush if outermost)."""
-        s = _sessions.get(sid)
-        if not s:
-            abort(404, description="Unknown session id")
+        s, lock = _lookup_session(sid)
         try:
-            s.commit()
-            return jsonify({"ok": True, "depth": s.depth()})
-        except RuntimeError as e:
+            with lock:
+                s.commit()
+                depth = s.depth()
+            return jsonify({"ok": True, "depth": depth})
+        except (RuntimeError, ValueError) as e:
+            # ValueError: a staged value (e.g. NaN) cannot be stored; the tx stays open
             abort(400, description=str(e))
 
     @app.post("/session/<sid>/rollback")
     def rollback_tx(sid):
         """Discard the top transaction layer."""
-        s = _sessions.get(sid)
-        if not s:
-            abort(404, description="Unknown session id")
+        s, lock = _lookup_session(sid)
         try:
-            s.rollback()
-            return jsonify({"ok": True, "depth": s.depth()})
+            with lock:
+                s.rollback()
+                depth = s.depth()
+            return jsonify({"ok": True, "depth": depth})
         except RuntimeError as e:
             abort(400, description=str(e))
 
@@ -83,13 +104,23 @@ def create_app(db_path=None):
     def set_key(key):
         """
         Set or update a key with the provided JSON value.
-        Request body must be: { "value": ... }
+        Request body must be: { "value": ... } sent as application/json.
         """
-        s = _get_session(request)
-        data = request.get_json(force=True, silent=True) or {}
-        if "value" not in data:
+        s, lock = _get_session(request)
+        if not request.is_json:
+            abort(415, description="Content-Type must be application/json")
+        body = request.get_data(cache=False)
+        try:
+            data = loads(body) if body else {}
+        except ValueError:
+            abort(400, description="Malformed JSON body")
+        if not isinstance(data, dict) or "value" not in data:
             abort(400, description="Missing 'value'")
-        s.set(key, data["value"])
+        try:
+            with lock:
+                s.set(key, data["value"])
+        except ValueError as e:
+            abort(400, description=str(e))  # e.g. NaN/Infinity, which JSON cannot store
         return jsonify({"ok": True})
 
     @app.get("/store/<key>")
@@ -98,8 +129,9 @@ def create_app(db_path=None):
         Get a key's current value.
         Returns {key, value, found}, with HTTP 404 if missing.
         """
-        s = _get_session(request)
-        v = s.get(key)
+        s, lock = _get_session(request)
+        with lock:
+            v = s.get(key)
         if v is None:
             return jsonify({"key": key, "value": None, "found": False}), 404
         return jsonify({"key": key, "value": v, "found": True})
@@ -107,8 +139,9 @@ def create_app(db_path=None):
     @app.delete("/store/<key>")
     def delete_key(key):
         """Delete a key (autocommit or within transaction)."""
-        s = _get_session(request)
-        s.delete(key)
+        s, lock = _get_session(request)
+        with lock:
+            s.delete(key)
         return jsonify({"ok": True})
     
     ENABLE_STORE_DUMP = os.getenv("ENABLE_STORE_DUMP", "0") == "1"
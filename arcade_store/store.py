@@ -1,75 +1,395 @@
 import os
 import time
+import collections
+import contextlib
 import sqlite3
+import enum
 import json
+import logging
+import math
+import queue
 import threading
-from typing import Any, Dict, List, Optional, Set, Tuple
+import uuid
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used otherwise
+    orjson = None
+
+
+# orjson natively encodes dataclasses, datetimes, non-str dict keys and
+# str/int/dict/list subclasses, none of which the stdlib encoder takes (or it
+# renders them differently). Passing them through makes orjson raise TypeError,
+# so they take the same stdlib path below and both encoders accept one set of types.
+_ORJSON_OPTS = (
+    orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson is not None else 0
+)
+
+
+def _json_default(value: Any) -> Any:
+    """Stdlib `default` hook for the types orjson encodes natively and cannot pass through."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _has_non_finite(value: Any) -> bool:
+    """
+    Return True if value holds a NaN or +/-Infinity float anywhere inside it.
+
+    Only called on values orjson already encoded, so nesting is bounded by
+    orjson's own depth limit; scalars are skipped by exact type to keep it cheap.
+    """
+    t = type(value)
+    if t is float:
+        return not math.isfinite(value)
+    if t is dict:
+        items = value.values()
+    elif t is list or t is tuple:
+        items = value
+    elif isinstance(value, enum.Enum):
+        return _has_non_finite(value.value)
+    else:
+        return isinstance(value, float) and not math.isfinite(value)
+    for v in items:
+        tv = type(v)
+        if tv is str or tv is int or tv is bool or v is None:
+            continue
+        if _has_non_finite(v):
+            return True
+    return False
+
+
+def _dumps(value: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON; the single encoder for DB rows and log records.
+
+    Raises:
+        ValueError: If the value contains NaN or +/-Infinity, which JSON cannot represent.
+        TypeError: If the value is not JSON-serializable.
+    """
+    if orjson is not None:
+        try:
+            out = orjson.dumps(value, option=_ORJSON_OPTS)
+        except TypeError:
+            pass  # wide ints, lone surrogates, passed-through types: use the stdlib encoder below
+        else:
+            # orjson silently writes NaN/Infinity as null; only output containing
+            # null needs the (cheap, encode-free) walk to tell them apart from None.
+            if b"null" in out and _has_non_finite(value):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return out
+    return json.dumps(
+        value, separators=(",", ":"), allow_nan=False, default=_json_default
+    ).encode()
+
+
+# Public decoder for stored values, also used by the API for request bodies.
+# Decoding always uses the stdlib: it reads back exactly whatever either encoder
+# wrote (orjson would turn ints wider than 64 bits into floats), as well as
+# rows written by older versions of the store.
+loads = json.loads
+
+# Decode columns selected as `... AS "<name> [arcade_json]"` inside the sqlite3
+# C layer (connections use PARSE_COLNAMES). Registered under a store-specific
+# name since the converter registry is process-global.
+sqlite3.register_converter("arcade_json", loads)
+
+_logger = logging.getLogger(__name__)
+
+# Log-queue sentinel: tells the log worker to finish the queue and exit.
+_LOG_STOP = object()
+
+# Read-cache marker for "key not cached" (None is cached for absent keys).
+_MISS = object()
+
+# (epoch second, formatted timestamp) of the last log record; swapped as one tuple
+_ts_cache: Tuple[int, str] = (-1, "")
+
+
+def _iso_second(ts: float) -> str:
+    """Format ts as an ISO-8601 UTC second, reusing the string within the same second."""
+    global _ts_cache
+    sec = int(ts)
+    cached = _ts_cache
+    if cached[0] != sec:
+        cached = _ts_cache = (sec, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec)))
+    return cached[1]
 
 
 class Store:
-    """Holds the shared SQLite connection and provides helpers to access the DB."""
+    """Holds the SQLite connections (one writer, pooled readers) and provides helpers to access the DB."""
+
+    # Autocommit writes between passive WAL checkpoints.
+    _CHECKPOINT_EVERY: int = 256
+    # Size of the reader connection pool.
+    _READERS: int = 8
+    # Seconds to wait for a free reader before giving up (matches busy_timeout).
+    _READER_TIMEOUT: float = 3.0
 
-    def __init__(self, db_path: str = ":memory:") -> None:
+    def __init__(self, db_path: str = ":memory:", read_cache_size: int = 0) -> None:
         """
-        Initialize the Store with an throwaway SQLite connection.
+        Initialize the Store: create the schema, then open a pool of reader
+        connections and a single writer connection.
 
         Args:
             db_path (str, optional): Path to the SQLite database file.
                 Defaults to ':memory:' for an in-memory database.
+            read_cache_size (int, optional): Max committed rows kept in the
+                in-memory LRU read cache. Defaults to 0 (disabled); opt in only
+                when this Store is the sole writer to the database.
 
         Notes:
             - Uses `check_same_thread=False` to allow access across threads.
+            - One writer, many readers: all writes are serialized through the
+              writer connection, reads borrow one of `_READERS` pooled ones.
             - Sets `journal_mode=WAL` (Write-Ahead Logging) for better concurrent reads.
-            - Ensures the `arcade_store` table exists with schema:
+            - Ensures the `arcade_store` table exists (WITHOUT ROWID) with schema:
                 - key   (TEXT, PRIMARY KEY)
-                - value (TEXT)
+                - value (BLOB, UTF-8 JSON; older databases may hold TEXT rows)
+            - Starts a daemon thread that formats and appends commit records to `log_path`.
+            - Call `close()` to release the Store (it also runs on garbage
+              collection and at interpreter exit).
+            - The read cache is invalidated by this Store's own writes only. With
+              another Store or process writing the same file (e.g. several
+              server workers) it would serve stale rows, so it is off by default.
         """
         self.log_path: str = "logs/store_commits.txt"
-        self._log_lock: threading.Lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        # commit log is written by a background thread; callers only enqueue lines
+        self._log_file = open(self.log_path, "ab", buffering=1 << 16)
+        self._log_q: "queue.Queue[tuple]" = queue.Queue()
+        # The worker only sees the queue and file, never self, so the Store stays collectable.
+        self._log_thread = threading.Thread(
+            target=Store._log_worker,
+            args=(self._log_q, self._log_file),
+            name="arcade-store-log",
+            daemon=True,
+        )
+        self._log_thread.start()
 
         self.db_path: str = db_path
-        self._tls: threading.local = threading.local()
 
-        init = sqlite3.connect(self.db_path, check_same_thread=False)
+        init = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         # one-time init on a throwaway connection to create schema
         try:
             init.execute("PRAGMA journal_mode=WAL;")     # enables readers during writes
             init.execute("PRAGMA busy_timeout=3000;")    # wait up to 3s on locks
             init.execute(
-                "CREATE TABLE IF NOT EXISTS arcade_store (key TEXT PRIMARY KEY, value TEXT)"
+                # WITHOUT ROWID: rows live in the primary-key B-tree, so a lookup is one tree walk
+                "CREATE TABLE IF NOT EXISTS arcade_store (key TEXT PRIMARY KEY, value BLOB) WITHOUT ROWID"
             )
-            init.commit()
         finally:
             init.close()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Return this thread's connection; creating it on first use."""
-        conn = getattr(self._tls, "conn", None)
-        if conn is None:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            # Re-apply pragmas on each new connection (journal_mode is db-level, others are per-conn)
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA busy_timeout=3000;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
-            self._tls.conn = conn
+        # Each pooled connection keeps one dedicated cursor that is reused for
+        # every statement, instead of conn.execute() allocating a fresh one.
+        self._read_pool: "queue.Queue[sqlite3.Cursor]" = queue.Queue()
+        for _ in range(self._READERS):
+            reader = self._connect()
+            reader.execute("PRAGMA query_only=ON;")
+            self._read_pool.put(reader.cursor())
+        self._writer: sqlite3.Cursor = self._connect().cursor()
+        self._write_lock: threading.Lock = threading.Lock()
+        self._autocommits: int = 0
+
+        # LRU of committed rows: key -> encoded value, or None if the key is absent.
+        # Encoded bytes (not decoded objects) are cached so callers never share
+        # a mutable value. _cache_gen bumps on every invalidation; a reader only
+        # fills the cache if no write landed while its query was in flight.
+        self._read_cache: "collections.OrderedDict[str, Optional[bytes]]" = collections.OrderedDict()
+        self._read_cache_size: int = read_cache_size
+        self._cache_lock: threading.Lock = threading.Lock()
+        self._cache_gen: int = 0
+
+        # Set by _release; shared with the finalizer, which cannot reference self.
+        self._closed: threading.Event = threading.Event()
+        self._finalizer = weakref.finalize(
+            self, Store._release,
+            self._closed, self._log_q, self._log_thread, self._log_file,
+            self._read_pool, self._writer, self._write_lock,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection pragmas applied."""
+        # isolation_level=None: the driver never issues an implicit BEGIN/COMMIT.
+        # Single statements autocommit; the only transactions are the explicit
+        # BEGIN IMMEDIATE ... COMMIT blocks in Session.commit.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_COLNAMES,
+        )
+        # Re-apply pragmas on each new connection (journal_mode is db-level, others are per-conn)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA busy_timeout=3000;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA mmap_size=268435456;")  # 256 MiB: serve reads from the mapped file
+        conn.execute("PRAGMA cache_size=-65536;")    # 64 MiB page cache (negative = KiB)
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA cache_spill=OFF;")      # keep dirty pages in cache until commit
         return conn
+
+    @contextlib.contextmanager
+    def _acquire_reader(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Borrow a pooled reader cursor for the duration of the block.
+
+        Raises:
+            RuntimeError: If the Store is closed, or no reader frees up within
+                `_READER_TIMEOUT` seconds.
+        """
+        if self._closed.is_set():
+            raise RuntimeError("Store is closed")
+        try:
+            cur = self._read_pool.get(timeout=self._READER_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError("No reader connection available (pool exhausted)") from None
+        try:
+            if self._closed.is_set():
+                raise RuntimeError("Store is closed")
+            yield cur
+        finally:
+            # Put back first, then re-check: _release sets the flag before it
+            # drains, so a reader returned after close is closed by one side or the other.
+            self._read_pool.put(cur)
+            if self._closed.is_set():
+                Store._close_readers(self._read_pool)
+
+    @contextlib.contextmanager
+    def _acquire_writer(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Hold the writer cursor exclusively for the duration of the block.
+
+        Raises:
+            RuntimeError: If the Store is closed.
+        """
+        with self._write_lock:
+            if self._closed.is_set():
+                raise RuntimeError("Store is closed")
+            yield self._writer
+
+    def _note_autocommit(self, cur: sqlite3.Cursor) -> None:
+        """Count an autocommit write; run a passive WAL checkpoint every `_CHECKPOINT_EVERY`.
+
+        Must be called with the writer held.
+        """
+        self._autocommits += 1
+        if self._autocommits >= self._CHECKPOINT_EVERY:
+            self._autocommits = 0
+            cur.execute("PRAGMA wal_checkpoint(PASSIVE);")
     
     # -- logging operations ---
     def _append_log(self, *, commit_type, writes, deletes) -> None:
-        record = {
-            "iso": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "thread": threading.current_thread().name,
+        """
+        Queue one commit record for the log.
+
+        `writes` is the list of (key, encoded value) pairs exactly as they were
+        written to the DB. Only the raw fields are captured here; the line is
+        formatted by the log worker, off the committing thread.
+        """
+        self._log_q.put(
+            (time.time(), threading.current_thread().name, commit_type, writes, deletes)
+        )
+
+    @staticmethod
+    def _log_key(key: Any) -> bytes:
+        """Encode a writes key as a JSON object key, coercing non-str keys to strings the way json does."""
+        if type(key) is str:
+            return _dumps(key)
+        # '{"<key>":null}' -> '"<key>"'; json raises TypeError for keys it cannot coerce
+        return json.dumps({key: None}, separators=(",", ":"))[1:-6].encode()
+
+    @staticmethod
+    def _format_log(ts, thread, commit_type, writes, deletes) -> bytes:
+        """Render one commit record as a JSON line, splicing in the already-encoded values."""
+        head = _dumps({
+            "iso": _iso_second(ts),
+            "thread": thread,
             "type": commit_type,           # "transaction" or "autocommit"
-            "writes": writes,
-            "deletes": sorted(deletes)
-        }
-        line = json.dumps(record, separators=(",", ":"))
-        with self._log_lock:
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+        })
+        body = b",".join(Store._log_key(k) + b":" + v for k, v in writes)
+        return head[:-1] + b',"writes":{' + body + b'},"deletes":' + _dumps(sorted(deletes, key=str)) + b"}\n"
+
+    @staticmethod
+    def _log_worker(q: "queue.Queue[tuple]", f) -> None:
+        """Drain queued records into the log file, flushing whenever the queue runs dry.
+
+        Exits after writing everything queued ahead of `_LOG_STOP`. A record that
+        fails to format, or a failed write, is reported and skipped; the worker
+        keeps running and every record is marked done so `print_log` never hangs.
+        """
+        while True:
+            batch = [q.get()]
+            while True:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            try:
+                lines = []
+                for rec in batch:
+                    if rec is _LOG_STOP:
+                        stop = True
+                        continue
+                    try:
+                        lines.append(Store._format_log(*rec))
+                    except Exception:
+                        _logger.exception("Dropping commit log record that could not be formatted")
+                f.write(b"".join(lines))
+                f.flush()
+            except Exception:
+                _logger.exception("Failed to write %d commit log record(s)", len(lines))
+            finally:
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                return
+
+    # --- lifecycle ---
+    def close(self) -> None:
+        """
+        Release the Store: write out any queued commit-log records, stop the
+        log worker, close the log file and every SQLite connection it opened.
+        Safe to call more than once.
+        """
+        self._finalizer()
+
+    @staticmethod
+    def _release(closed, log_q, log_thread, log_file, read_pool, writer, write_lock) -> None:
+        """Finalizer behind `close()`; takes no reference to the Store itself."""
+        closed.set()
+        log_q.put(_LOG_STOP)
+        log_thread.join()
+        log_file.close()
+        # Readers still checked out are closed when they come back (see _acquire_reader).
+        Store._close_readers(read_pool)
+        with write_lock:  # let an in-flight commit finish first
+            writer.connection.close()
+
+    @staticmethod
+    def _close_readers(read_pool: "queue.Queue[sqlite3.Cursor]") -> None:
+        """Close every reader currently sitting in the pool."""
+        while True:
+            try:
+                reader = read_pool.get_nowait()
+            except queue.Empty:
+                return
+            reader.connection.close()
     
     def print_log(self) -> str:
         """Return the entire commit log as plain text."""
+        if self._log_thread.is_alive():
+            self._log_q.join()  # wait for queued lines to reach the file
         try:
             with open(self.log_path, "r", encoding="utf-8") as f:
                 return f.read()
@@ -88,36 +408,67 @@ class Store:
             Any | None: The deserialized value associated with the key,
             or None if the key does not exist.
         """
-        conn = self._get_conn()
-        query = conn.execute(
-                    "SELECT value FROM arcade_store WHERE key = ?",
-                    (key,))
-        result = query.fetchone()
-        if result is None:
-            return None
-        return json.loads(result[0])
-
-    def _db_set(self, key: str, value: Any) -> None:
+        if not self._read_cache_size:
+            raw = self._select_value(key)
+            return None if raw is None else loads(raw)
+
+        cache = self._read_cache
+        with self._cache_lock:
+            raw = cache.get(key, _MISS)
+            if raw is not _MISS:
+                cache.move_to_end(key)
+            gen = self._cache_gen
+        if raw is _MISS:
+            raw = self._select_value(key)
+            with self._cache_lock:
+                if gen == self._cache_gen:
+                    cache[key] = raw
+                    if len(cache) > self._read_cache_size:
+                        cache.popitem(last=False)
+        return None if raw is None else loads(raw)
+
+    def _select_value(self, key: str) -> Optional[bytes]:
+        """Return the stored (encoded) value for key, or None if absent."""
+        with self._acquire_reader() as cur:
+            result = cur.execute(
+                        "SELECT value FROM arcade_store WHERE key = ?",
+                        (key,)).fetchone()
+        return None if result is None else result[0]
+
+    def _invalidate(self, keys) -> None:
+        """Drop keys from the read cache after a write to them has committed."""
+        with self._cache_lock:
+            self._cache_gen += 1
+            for k in keys:
+                self._read_cache.pop(k, None)
+
+    def _db_set(self, key: str, value: Any) -> bytes:
         """
-        Insert or update a key-value pair in the database.
+        Insert or update a key-value pair in the database (autocommit).
 
         Args:
             key (str): The unique key to insert or update.
             value (Any): The value to store (will be serialized to JSON).
 
+        Returns:
+            bytes: The encoded value as stored.
+
         Notes:
             - If the key already exists, its value is updated (upsert).
         """
-        conn = self._get_conn()
-        deserialized_value = json.dumps(value, separators=(",", ":"))
-        conn.execute(
-            "INSERT INTO arcade_store(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-            (key, deserialized_value),
-        )
+        encoded = _dumps(value)
+        with self._acquire_writer() as cur:
+            cur.execute(
+                "INSERT INTO arcade_store(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, encoded),
+            )
+            self._note_autocommit(cur)
+            self._invalidate((key,))
+        return encoded
 
     def _db_delete(self, key: str) -> None:
         """
-        Delete a key-value pair from the database.
+        Delete a key-value pair from the database (autocommit).
 
         Args:
             key (str): The unique key to delete.
@@ -125,10 +476,12 @@ class Store:
         Returns:
             None
         """
-        conn = self._get_conn()
-        conn.execute(
-            "DELETE FROM arcade_store WHERE key = ?",
-            (key,))
+        with self._acquire_writer() as cur:
+            cur.execute(
+                "DELETE FROM arcade_store WHERE key = ?",
+                (key,))
+            self._note_autocommit(cur)
+            self._invalidate((key,))
 
     # --- session management ---
     def new_session(self) -> "Session":
@@ -144,14 +497,31 @@ class Store:
         return Session(self)
     
     # --- dump entire committed db ---
-    def print_db(self) -> List[Tuple[str, Any]]:
+    def print_db(self) -> Iterator[Tuple[str, Any]]:
         """
-        Return ALL committed (key, value) rows from the database.
+        Stream ALL committed (key, value) rows from the database, ordered by key.
+
+        The whole dump is read from one snapshot, so a transaction committed
+        while iterating is seen either entirely or not at all. Each call opens
+        its own short-lived read-only connection outside the pool (a slow
+        consumer never starves `get`); it is closed when the generator is
+        exhausted, closed, or garbage collected. An open dump pins its
+        snapshot, so WAL checkpoints cannot recycle the log past it meanwhile.
+
+        Raises:
+            RuntimeError: If the Store is closed.
         """
-        conn = self._get_conn()
-        db = conn.execute("SELECT key, value FROM arcade_store ORDER BY key").fetchall()
-        return [(k, json.loads(v)) for (k, v) in db] 
-    
+        if self._closed.is_set():
+            raise RuntimeError("Store is closed")
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA query_only=ON;")
+            conn.execute("BEGIN")  # deferred: the snapshot is taken at the first read
+            yield from conn.execute(
+                'SELECT key, value AS "value [arcade_json]" FROM arcade_store ORDER BY key'
+            )
+        finally:
+            conn.close()  # ends the read transaction
 
 class Session:
     """
@@ -180,7 +550,7 @@ class Session:
         Initialize a session tied to a Store.
 
         Args:
-            store (Store): The backing store that owns the SQLite connection.
+            store (Store): The backing store that owns the SQLite connections.
         """
         self.store = store
         self._stack: List[Tuple[Dict[str, Any], Set[str]]] = []
@@ -210,42 +580,52 @@ class Session:
 
         Raises:
             RuntimeError: If there is no active transaction to commit.
+            ValueError: If a pending value cannot be encoded (the transaction
+                stays open).
         """
         if not self._stack:
             raise RuntimeError("No active transaction to commit")
+        if len(self._stack) == 1:
+            # Encode every final value exactly once, before popping, so a value
+            # _dumps rejects leaves the transaction intact.
+            ups = [(k, _dumps(v)) for k, v in self._stack[0][0].items()]
         top_writes, top_deleted = self._stack.pop()
 
         if self._stack:
-            # Merge into parent layer
+            # Merge into parent layer. Within a layer a key is never both
+            # written and deleted, so the bulk set/dict ops below are exact.
             parent_writes, parent_deleted = self._stack[-1]
             # Apply deletions to parent
+            parent_deleted |= top_deleted
             for k in top_deleted:
-                parent_deleted.add(k)
-                if k in parent_writes:
-                    del parent_writes[k]
+                parent_writes.pop(k, None)
             # Apply writes to parent
-            for k, v in top_writes.items():
-                parent_writes[k] = v
-                if k in parent_deleted:
-                    parent_deleted.remove(k)
+            parent_writes.update(top_writes)
+            parent_deleted.difference_update(top_writes)
             return
 
-        # Outermost: flush to DB atomically on a separate thread's connection
-        conn = self.store._get_conn() 
-        try:
-            conn.execute("BEGIN;")
-            for k in top_deleted:
-                self.store._db_delete(k)
-            for k, v in top_writes.items():
-                self.store._db_set(k, v)
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        # Outermost: flush to DB atomically on the writer connection.
+        # BEGIN IMMEDIATE takes the write lock up front so the transaction
+        # never has to upgrade from a read lock mid-flush.
+        dels = [(k,) for k in top_deleted]
+        with self.store._acquire_writer() as cur:
+            try:
+                cur.execute("BEGIN IMMEDIATE;")
+                cur.executemany("DELETE FROM arcade_store WHERE key = ?", dels)
+                cur.executemany(
+                    "INSERT INTO arcade_store(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                    ups,
+                )
+                cur.execute("COMMIT;")
+                self.store._invalidate([*top_deleted, *top_writes])
+            except Exception:
+                if cur.connection.in_transaction:
+                    cur.execute("ROLLBACK;")
+                raise
         
         self.store._append_log(
             commit_type="transaction",
-            writes=top_writes,
+            writes=ups,
             deletes=list(top_deleted),
         )
 
@@ -275,12 +655,10 @@ class Session:
         """
         if not self._stack:
             # autocommit
-            conn = self.store._get_conn()
-            self.store._db_set(key, value)
-            conn.commit()
+            encoded = self.store._db_set(key, value)
             self.store._append_log(
                 commit_type="autocommit",
-                writes={key: value},
+                writes=[(key, encoded)],
                 deletes=[]
             )
             return
@@ -300,8 +678,13 @@ class Session:
             Any | None: The value if present (including from pending writes),
             or None if deleted in any active layer or absent from the database.
         """
+        stack = self._stack
+        if not stack:
+            # Autocommit: nothing buffered, go straight to the DB
+            return self.store._db_get(key)
         # Search from top layer down
-        for writes, deleted in reversed(self._stack):
+        for i in range(len(stack) - 1, -1, -1):
+            writes, deleted = stack[i]
             if key in deleted:
                 return None
             if key in writes:
@@ -322,12 +705,10 @@ class Session:
             - With no active transaction, the deletion is autocommitted.
         """
         if not self._stack:
-            conn = self.store._get_conn()
             self.store._db_delete(key)
-            conn.commit()
             self.store._append_log(
                 commit_type="autocommit",
-                writes={},
+                writes=[],
                 deletes=[key]
             )
             return
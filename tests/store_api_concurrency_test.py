@@ -6,7 +6,7 @@ from arcade_store.store import Store
 # RUN USING python -m pytest -v
 
 # Notes:
-# - Each thread uses its own SQLite connection (thread-local in Store).
+# - Reads borrow a pooled SQLite connection; writes share one writer connection (see Store).
 # - SQLite (with WAL mode) allows many concurrent readers but only one writer at a time.
 # - These tests verify transaction isolation, atomic commit behavior, and last-write-wins semantics.
 
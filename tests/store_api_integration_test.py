@@ -9,7 +9,8 @@ def client(tmp_path):
     db = tmp_path / "api.sqlite3"
     app = create_app(str(db))
     app.config.update(TESTING=True)
-    return app.test_client()
+    yield app.test_client()
+    app.extensions["arcade_store"].close()
 
 def test_session_lifecycle_and_kv_visibility(client):
     # Create a session
@@ -90,6 +91,25 @@ def test_bad_requests(client):
     r = client.post("/session/does-not-exist/begin")
     assert r.status_code == 404
 
+def test_put_requires_json_body(client):
+    # Non-JSON content type is rejected before parsing
+    r = client.put("/store/k", data=json.dumps({"value": 1}), headers={"Content-Type": "text/plain"})
+    assert r.status_code == 415
+
+    # Malformed JSON and empty bodies are client errors
+    hdr = {"Content-Type": "application/json"}
+    assert client.put("/store/k", data="{not json", headers=hdr).status_code == 400
+    assert client.put("/store/k", data="", headers=hdr).status_code == 400
+    assert client.put("/store/k", data="[1, 2]", headers=hdr).status_code == 400
+    assert client.put("/store/k", data='{"value": NaN}', headers=hdr).status_code == 400
+    assert client.get("/store/k").status_code == 404
+
+def test_big_int_values_round_trip(client):
+    hdr = {"Content-Type": "application/json"}
+    r = client.put("/store/big", data='{"value": 1180591620717411303425}', headers=hdr)
+    assert r.status_code == 200
+    assert client.get("/store/big").get_json()["value"] == 2**70 + 1
+
 def test_nested_commit_rollback(client):
     sid = client.post("/session").get_json()["session_id"]
     hdr = {"X-Session-ID": sid, "Content-Type": "application/json"}
@@ -111,3 +131,18 @@ def test_nested_commit_rollback(client):
     # Rollback outer (discard changes)
     client.post(f"/session/{sid}/rollback")   # depth 0
     assert client.get("/store/x").status_code == 404
+
+def test_session_registry_evicts_least_recently_used(tmp_path):
+    app = create_app(str(tmp_path / "lru.sqlite3"), max_sessions=2)
+    app.config.update(TESTING=True)
+    client = app.test_client()
+
+    a = client.post("/session").get_json()["session_id"]
+    b = client.post("/session").get_json()["session_id"]
+    # touch a so b becomes the least recently used
+    assert client.post(f"/session/{a}/begin").status_code == 200
+    client.post("/session")
+
+    assert client.post(f"/session/{b}/begin").status_code == 404
+    assert client.post(f"/session/{a}/commit").status_code == 200
+    app.extensions["arcade_store"].close()
@@ -1,3 +1,9 @@
+import contextlib
+import gc
+import json
+import sqlite3
+import threading
+import weakref
 import pytest
 from arcade_store.store import Store
 
@@ -113,4 +119,231 @@ def test_large_values(tmp_path):
     s.set("big", big)
     s.commit()
 
-    assert store._db_get("big") == big
\ No newline at end of file
+    assert store._db_get("big") == big
+
+def test_commit_log_records(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    s = store.new_session()
+
+    s.set("logged", 1)
+    s.begin()
+    s.set("tx", 2)
+    s.delete("gone")
+    s.commit()
+
+    *_, auto, tx = [json.loads(l) for l in store.print_log().splitlines()]
+    assert auto["type"] == "autocommit" and auto["writes"] == {"logged": 1}
+    assert tx["type"] == "transaction"
+    assert tx["writes"] == {"tx": 2} and tx["deletes"] == ["gone"]
+
+
+def test_commit_log_coerces_non_str_keys(tmp_path):
+    store = Store(str(tmp_path / "test.sqlite3"))
+    s = store.new_session()
+
+    s.begin()
+    s.set(1, "x")
+    s.set(2.5, "y")
+    s.commit()
+
+    last = json.loads(store.print_log().splitlines()[-1])
+    assert last["writes"] == json.loads(json.dumps({1: "x", 2.5: "y"}))
+
+
+def test_read_cache_invalidation_and_isolation(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db), read_cache_size=2)
+    s = store.new_session()
+
+    s.set("c", {"n": 1})
+    assert s.get("c") == {"n": 1}  # fills the cache
+    # callers get their own copy; mutating it must not leak into the cache
+    s.get("c")["n"] = 99
+    assert s.get("c") == {"n": 1}
+
+    # autocommit and transactional writes both invalidate cached rows
+    s.set("c", {"n": 2})
+    assert s.get("c") == {"n": 2}
+    s.begin()
+    s.delete("c")
+    s.commit()
+    assert store.new_session().get("c") is None
+
+    # cache stays bounded
+    for k in ("a", "b", "d"):
+        s.set(k, k)
+        assert s.get(k) == k
+    assert len(store._read_cache) <= 2
+
+
+def test_print_db_streams_sorted_rows(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    s = store.new_session()
+    s.begin()
+    for k, v in (("b", [1, 2]), ("a", {"x": 1}), ("c", "three")):
+        s.set(k, v)
+    s.commit()
+
+    # partially consumed streams use their own connections, not pooled readers
+    held = [store.print_db() for _ in range(store._READERS + 1)]
+    for rows in held:
+        assert next(rows) == ("a", {"x": 1})
+    assert store._read_pool.qsize() == store._READERS
+    assert store._db_get("c") == "three"
+
+    assert list(store.print_db()) == [("a", {"x": 1}), ("b", [1, 2]), ("c", "three")]
+    assert [k for k, _ in held[0]] == ["b", "c"]
+    store.close()
+
+
+def test_print_db_reads_one_snapshot(tmp_path):
+    store = Store(str(tmp_path / "test.sqlite3"))
+    s = store.new_session()
+    s.begin()
+    s.set("a", 10)
+    for i in range(2000):  # enough rows that "z" is read well after "a"
+        s.set(f"m{i:04}", i)
+    s.set("z", 0)
+    s.commit()
+
+    rows = store.print_db()
+    assert next(rows) == ("a", 10)
+    # move the value from "a" to "z" while the dump is halfway through
+    s.begin()
+    s.set("a", 0)
+    s.set("z", 10)
+    s.commit()
+    assert list(rows)[-1] == ("z", 0)
+    assert store._db_get("z") == 10
+
+    store.close()
+    with pytest.raises(RuntimeError, match="Store is closed"):
+        next(store.print_db())
+
+
+def test_reader_pool_exhaustion_raises(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    store._READER_TIMEOUT = 0.05
+
+    with contextlib.ExitStack() as stack:
+        for _ in range(store._READERS):
+            stack.enter_context(store._acquire_reader())
+        with pytest.raises(RuntimeError):
+            store._db_get("anything")
+    assert store._db_get("anything") is None
+    store.close()
+
+
+def test_close_drains_log_and_releases_store(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    store.new_session().set("closing", 1)
+    store.close()
+    store.close()  # idempotent
+
+    assert not store._log_thread.is_alive()
+    assert store._log_file.closed
+    assert store._read_pool.empty()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store._writer.execute("SELECT 1")
+    with open(store.log_path, encoding="utf-8") as f:
+        assert json.loads(f.read().splitlines()[-1])["writes"] == {"closing": 1}
+
+    # an unreferenced Store is collected and its worker stopped
+    other = Store(str(db))
+    thread, ref = other._log_thread, weakref.ref(other)
+    del other
+    gc.collect()
+    assert ref() is None
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_closed_store_rejects_use_and_closes_returned_readers(tmp_path):
+    store = Store(str(tmp_path / "test.sqlite3"))
+    s = store.new_session()
+    s.set("k", 1)
+
+    with store._acquire_reader() as held:
+        store.close()
+        held.execute("SELECT 1")  # still usable until it is handed back
+    assert store._read_pool.empty()
+    with pytest.raises(sqlite3.ProgrammingError):
+        held.execute("SELECT 1")
+
+    with pytest.raises(RuntimeError, match="Store is closed"):
+        s.get("k")
+    with pytest.raises(RuntimeError, match="Store is closed"):
+        s.set("k", 2)
+
+
+def test_values_round_trip_exactly(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    s = store.new_session()
+
+    cases = {
+        "big": 2**70 + 1,
+        "neg_big": -(2**64),
+        "surrogate": "\ud800",
+        "nested": {"n": 2**65, "s": ["\udfff", 1.5], "none": None},
+    }
+    for k, v in cases.items():
+        s.set(k, v)
+    s.begin()
+    s.set("tx_big", 2**70 + 1)
+    s.commit()
+
+    for k, v in cases.items():
+        assert store.new_session().get(k) == v
+    assert store._db_get("tx_big") == 2**70 + 1
+    assert dict(store.print_db()) == {**cases, "tx_big": 2**70 + 1}
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), {"x": [float("-inf")]}])
+def test_non_finite_floats_rejected(tmp_path, bad):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    s = store.new_session()
+
+    with pytest.raises(ValueError):
+        s.set("f", bad)
+    assert s.get("f") is None
+
+    s.begin()
+    s.set("f", bad)
+    with pytest.raises(ValueError):
+        s.commit()
+    assert s.depth() == 1  # transaction left open for the caller to fix
+    s.set("f", 1.0)
+    s.commit()
+    assert store._db_get("f") == 1.0
+
+
+def test_commit_log_survives_bad_records(tmp_path):
+    db = tmp_path / "test.sqlite3"
+    store = Store(str(db))
+    s = store.new_session()
+
+    # mixed key types in deletes used to kill the log worker inside sorted()
+    s.begin()
+    s.delete(1)
+    s.delete("a")
+    s.commit()
+    # a record that cannot be formatted at all is reported and skipped
+    store._append_log(commit_type="transaction", writes=[("k", None)], deletes=[])
+    s.set("after", 1)
+
+    out = {}
+    t = threading.Thread(target=lambda: out.setdefault("log", store.print_log()), daemon=True)
+    t.start()
+    t.join(timeout=5)
+    assert not t.is_alive(), "print_log hung"
+
+    *_, mixed, after = [json.loads(l) for l in out["log"].splitlines()]
+    assert sorted(map(str, mixed["deletes"])) == ["1", "a"]
+    assert after["writes"] == {"after": 1}
+    store.close()